@@ -7,12 +7,42 @@ This file centralizes all configuration, making it easy to:
 - Keep sensitive data in environment variables
 """
 
+import logging
 import os
-from dotenv import load_dotenv
-from typing import List
+import re
+from typing import List, Tuple
+
+from models import EMAIL_PATTERN
+
+
+# Path of the .env file in the project root
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+
+_ENV_LOADED = False
+
+
+def _load_env_once():
+    """
+    Loads environment variables from the .env file, at most once.
+    
+    Skipped when APP_ENV is "production" (the platform provides the
+    variables) or when there is no .env file. python-dotenv is only
+    imported when it is actually needed. Existing environment variables
+    are never overridden.
+    """
+    global _ENV_LOADED
+    if _ENV_LOADED or os.getenv("APP_ENV") == "production":
+        return
+    
+    if os.path.exists(ENV_FILE):
+        from dotenv import load_dotenv
+        load_dotenv(ENV_FILE, override=False)
+    
+    _ENV_LOADED = True
+
 
 # Load environment variables from .env file
-load_dotenv()
+_load_env_once()
 
 
 class Settings:
@@ -28,15 +58,18 @@ class Settings:
     APP_DESCRIPTION: str = "Profile endpoint with dynamic cat facts"
     
     # Server Settings
+    APP_ENV: str = os.getenv("APP_ENV", "development")
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
-    DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
+    # Debug (auto-reload) is off by default in production
+    DEBUG: bool = os.getenv("DEBUG", str(APP_ENV != "production")).lower() == "true"
+    WORKERS: int = int(os.getenv("WEB_CONCURRENCY", "1"))
     
     # User Information (from environment variables)
     # ⚠️ IMPORTANT: Replace these in your .env file!
     USER_EMAIL: str = os.getenv("USER_EMAIL", "your.email@example.com")
     USER_NAME: str = os.getenv("USER_NAME", "Your Full Name")
-    USER_STACK: str = os.getenv("USER_STACK", "JavaScript/Nodejs")
+    USER_STACK: str = os.getenv("USER_STACK", "Python/FastAPI")
     
     # External API Settings
     CAT_FACT_API_URL: str = "https://catfact.ninja/fact"
@@ -48,7 +81,7 @@ class Settings:
         "http://localhost:8080",  # Vue default
         "*"  # Allow all (only for development/testing)
     ]
-    CORS_ALLOW_CREDENTIALS: bool = True
+    CORS_ALLOW_CREDENTIALS: bool = False  # Browsers reject credentials with a "*" origin
     CORS_ALLOW_METHODS: List[str] = ["*"]
     CORS_ALLOW_HEADERS: List[str] = ["*"]
     
@@ -56,36 +89,66 @@ class Settings:
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
 
+# Same email shape check as the UserInfo schema, precompiled for startup
+_EMAIL_RE = re.compile(EMAIL_PATTERN)
+
+
 # Create a global settings instance
 settings = Settings()
 
 
+# Configure logging once for the whole application
+# (uvicorn-only levels such as "trace" aren't known to logging - use INFO)
+_log_level = logging.getLevelName(settings.LOG_LEVEL.upper())
+if not isinstance(_log_level, int):
+    _log_level = logging.INFO
+
+logging.basicConfig(
+    level=_log_level,
+    format="%(asctime)s %(levelname)s %(message)s"
+)
+# httpx logs every outgoing request at INFO - keep that off the request path
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# CORS settings resolved once into immutable tuples
+# (read by the CORS middleware when the app starts)
+CORS_ALLOW_ALL: bool = "*" in settings.CORS_ORIGINS
+# "*" already allows every origin, so specific origins next to it are redundant
+CORS_ORIGINS: Tuple[str, ...] = ("*",) if CORS_ALLOW_ALL else tuple(settings.CORS_ORIGINS)
+CORS_METHODS: Tuple[str, ...] = tuple(settings.CORS_ALLOW_METHODS)
+CORS_HEADERS: Tuple[str, ...] = tuple(settings.CORS_ALLOW_HEADERS)
+# Browsers reject credentials together with a "*" origin, so don't send them
+CORS_ALLOW_CREDENTIALS: bool = settings.CORS_ALLOW_CREDENTIALS and not CORS_ALLOW_ALL
+
+
 # Validation: Check if required environment variables are set
 def validate_settings():
     """
     Validates that all required settings are properly configured.
     
-    Raises a warning if using default values that should be customized.
+    Logs a single warning record listing every default value that
+    should be customized.
     """
     warnings = []
     
     if settings.USER_EMAIL == "your.email@example.com":
-        warnings.append("⚠️  USER_EMAIL is using default value. Set it in .env file.")
+        warnings.append("USER_EMAIL is using default value. Set it in .env file.")
+    elif not _EMAIL_RE.match(settings.USER_EMAIL):
+        warnings.append(f"USER_EMAIL '{settings.USER_EMAIL}' doesn't look like a valid email address.")
     
     if settings.USER_NAME == "Your Full Name":
-        warnings.append("⚠️  USER_NAME is using default value. Set it in .env file.")
+        warnings.append("USER_NAME is using default value. Set it in .env file.")
+    
+    if settings.USER_STACK == "Python/FastAPI":
+        warnings.append("USER_STACK is using default value. You may want to customize it.")
     
-    if settings.USER_STACK == "JavaScript/Nodejs":
-        warnings.append("⚠️  USER_STACK is using default value. You may want to customize it.")
+    if CORS_ALLOW_ALL and settings.CORS_ALLOW_CREDENTIALS:
+        warnings.append("CORS_ALLOW_CREDENTIALS is ignored because CORS_ORIGINS contains \"*\".")
     
     if warnings:
-        print("\n" + "="*60)
-        print("⚠️  CONFIGURATION WARNINGS:")
-        print("="*60)
-        for warning in warnings:
-            print(f"  {warning}")
-        print("\nPlease update your .env file with your actual information!")
-        print("="*60 + "\n")
+        logging.getLogger("app").warning(
+            "⚠️  Configuration warnings:\n" + "\n".join(f"  - {warning}" for warning in warnings)
+        )
 
 
 # Run validation when module is imported
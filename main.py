@@ -3,19 +3,71 @@ Main FastAPI application for HNG Stage 0.
 
 This is the entry point of the application. It:
 - Initializes the FastAPI app
-- Sets up middleware (CORS)
+- Sets up middleware (errors, CORS and preflight fast path, see middleware.py)
 - Defines API endpoints
 - Delegates business logic to services module
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response
 
 # Import our custom modules
+from middleware import CORSMiddleware, PreflightShortCircuit, UnhandledErrorMiddleware
 from models import ProfileResponse, HealthResponse
-from services import build_profile_response, get_current_timestamp
-from config import settings
+from services import (
+    build_profile_body,
+    get_current_timestamp,
+    open_client,
+    close_client,
+    warm_fact_cache
+)
+from config import (
+    settings,
+    CORS_ALLOW_ALL,
+    CORS_ORIGINS,
+    CORS_METHODS,
+    CORS_HEADERS,
+    CORS_ALLOW_CREDENTIALS
+)
+
+
+logger = logging.getLogger("app")
+
+
+# Lifespan - runs once when the application starts and once when it stops
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Manages application startup and shutdown.
+    
+    Everything before `yield` runs on startup, everything after it on
+    shutdown, so resources are opened and closed in one place:
+    - Opens the shared HTTP client used for Cat Facts API calls
+    - Pre-loads a cat fact so the first /me request is served from cache
+    - Closes the HTTP client on shutdown
+    
+    Mounted sub-apps with their own lifespans can be nested here with
+    `async with subapp.router.lifespan_context(subapp):`.
+    """
+    open_client()
+    await warm_fact_cache()
+    
+    # One log record per process instead of several prints
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} starting | "
+            f"user={settings.USER_NAME} email={settings.USER_EMAIL} stack={settings.USER_STACK} | "
+            f"docs=http://{settings.HOST}:{settings.PORT}/docs"
+        )
+    
+    try:
+        yield
+    finally:
+        await close_client()
+        logger.info(f"👋 {settings.APP_NAME} shutting down...")
 
 
 # Initialize FastAPI app with metadata from config
@@ -24,21 +76,34 @@ app = FastAPI(
     description=settings.APP_DESCRIPTION,
     version=settings.APP_VERSION,
     docs_url="/docs",  # Swagger UI
-    redoc_url="/redoc"  # ReDoc UI
+    redoc_url="/redoc",  # ReDoc UI
+    default_response_class=ORJSONResponse,  # Fast JSON serialization
+    lifespan=lifespan
 )
 
 
+# Turn unexpected errors into a generic JSON 500
+# Added before CORS so it runs inside it and the 500 gets CORS headers
+app.add_middleware(UnhandledErrorMiddleware)
+
+
 # Add CORS middleware
 # CORS = Cross-Origin Resource Sharing
 # This allows frontends from different domains to access your API
+# (pure-ASGI implementation from middleware.py - headers are precomputed once)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
-    allow_methods=settings.CORS_ALLOW_METHODS,
-    allow_headers=settings.CORS_ALLOW_HEADERS,
+    allow_origins=CORS_ORIGINS,
+    allow_credentials=CORS_ALLOW_CREDENTIALS,
+    allow_methods=CORS_METHODS,
+    allow_headers=CORS_HEADERS,
 )
 
+# With allow-all CORS every preflight gets the same answer, so reply to it
+# before any other middleware or routing runs. Added last = runs first.
+if CORS_ALLOW_ALL and "*" in CORS_HEADERS:
+    app.add_middleware(PreflightShortCircuit, allow_methods=CORS_METHODS)
+
 
 @app.get("/", tags=["Root"])
 async def root():
@@ -61,7 +126,9 @@ async def root():
     }
 
 
-@app.get("/health", response_model=HealthResponse, tags=["Monitoring"])
+# Models are only used for the docs (responses=...), not to re-validate
+# the returned data, which already has the right shape
+@app.get("/health", responses={200: {"model": HealthResponse}}, tags=["Monitoring"])
 async def health_check():
     """
     Health check endpoint.
@@ -78,7 +145,7 @@ async def health_check():
     }
 
 
-@app.get("/me", response_model=ProfileResponse, tags=["Profile"])
+@app.get("/me", responses={200: {"model": ProfileResponse}}, tags=["Profile"])
 async def get_profile():
     """
     Returns profile information along with a random cat fact.
@@ -87,7 +154,7 @@ async def get_profile():
     
     Features:
     - Returns your personal information (email, name, stack)
-    - Fetches a fresh cat fact from an external API on every request
+    - Serves a cat fact from an external API (cached, refreshed in the background)
     - Includes the current UTC timestamp
     - Updates dynamically with each request
     
@@ -96,7 +163,7 @@ async def get_profile():
         
     Raises:
         HTTPException: 
-            - 503 if Cat Facts API is unavailable
+            - 503 if Cat Facts API is unavailable and no fact is cached
             - 500 for unexpected errors
     
     Example Response:
@@ -113,73 +180,32 @@ async def get_profile():
         }
         ```
     """
-    try:
-        # Delegate business logic to services module
-        # This keeps our endpoint clean and focused
-        response_data = await build_profile_response()
-        
-        # Return JSON response with explicit content type
-        return JSONResponse(
-            content=response_data,
-            status_code=200,
-            headers={"Content-Type": "application/json"}
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions from services
-        # (e.g., when Cat Facts API fails)
-        raise
-        
-    except Exception as e:
-        # Handle any unexpected errors
-        raise HTTPException(
-            status_code=500,
-            detail=f"Internal server error: {str(e)}"
-        )
-
-
-# Startup event - runs when the application starts
-@app.on_event("startup")
-async def startup_event():
-    """
-    Runs when the application starts.
-    
-    Good place to:
-    - Initialize database connections
-    - Load ML models
-    - Run configuration checks
-    - Log startup information
-    """
-    print(f"\n🚀 {settings.APP_NAME} v{settings.APP_VERSION} starting...")
-    print(f"📝 User: {settings.USER_NAME}")
-    print(f"📧 Email: {settings.USER_EMAIL}")
-    print(f"🛠️  Stack: {settings.USER_STACK}")
-    print(f"📚 Docs: http://{settings.HOST}:{settings.PORT}/docs\n")
-
-
-# Shutdown event - runs when the application stops
-@app.on_event("shutdown")
-async def shutdown_event():
-    """
-    Runs when the application shuts down.
+    # Delegate business logic to services module
+    # This keeps our endpoint clean and focused
+    # (the JSON body comes back pre-serialized from a byte template)
+    # HTTPExceptions from services (e.g., when Cat Facts API fails) and
+    # unexpected errors propagate to the app-level handlers
+    body = await build_profile_body()
     
-    Good place to:
-    - Close database connections
-    - Clean up resources
-    - Save state
-    """
-    print(f"\n👋 {settings.APP_NAME} shutting down...\n")
+    # Return the JSON bytes as-is - no dict walk or re-serialization
+    # (media_type sets Content-Type; 200 is the default status)
+    return Response(content=body, media_type="application/json")
 
 
 # Run the application
 # This block only executes when running the file directly
 # (not when imported as a module)
-#if __name__ == "__main__":
-    #import uvicorn
+if __name__ == "__main__":
+    import uvicorn
     
-    #uvicorn.run(
-       # "main:app",
-       # host=settings.HOST,
-      #  port=settings.PORT,
-       # reload=settings.DEBUG  # Auto-reload on code changes in debug mode
-    #)
\ No newline at end of file
+    uvicorn.run(
+        "main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        reload=settings.DEBUG,  # Auto-reload on code changes in debug mode
+        workers=settings.WORKERS,  # Ignored when reload is on
+        # loop/http stay on "auto": uvloop and httptools are used whenever
+        # they are installed (uvicorn[standard] installs them where supported)
+        log_level=settings.LOG_LEVEL.lower(),
+        access_log=settings.DEBUG  # No log line per request in production
+    )
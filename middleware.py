@@ -0,0 +1,284 @@
+"""
+Custom ASGI middleware for the application.
+
+These middleware classes talk to the ASGI server directly (scope, receive,
+send) instead of building Request/Response objects, so they add very
+little overhead to every request that passes through them.
+"""
+
+import logging
+from typing import Sequence
+
+
+logger = logging.getLogger("app")
+
+
+# Headers every CORS-enabled response may carry
+SAFELISTED_HEADERS = {"accept", "accept-language", "content-language", "content-type"}
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+
+
+class CORSMiddleware:
+    """
+    Pure-ASGI CORS middleware.
+
+    Mirrors the behaviour of Starlette's CORSMiddleware, but all response
+    headers are precomputed as byte tuples when the app starts, so each
+    request only has to look up the Origin header and append cached values.
+
+    Attributes:
+        app: The wrapped ASGI application
+        allow_origins: Origins allowed to call the API ("*" allows any)
+        allow_methods: HTTP methods allowed in preflight requests
+        allow_headers: Request headers allowed in preflight requests
+        allow_credentials: Whether cookies/credentials may be sent
+    """
+
+    def __init__(
+        self,
+        app,
+        allow_origins: Sequence[str] = (),
+        allow_methods: Sequence[str] = ("GET",),
+        allow_headers: Sequence[str] = (),
+        allow_credentials: bool = False,
+        expose_headers: Sequence[str] = (),
+        max_age: int = 600,
+    ) -> None:
+        if "*" in allow_methods:
+            allow_methods = ALL_METHODS
+
+        self.app = app
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        self.allow_methods = tuple(allow_methods)
+        self.allow_headers = tuple(sorted(SAFELISTED_HEADERS | {h.lower() for h in allow_headers}))
+        self.allow_credentials = allow_credentials
+
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_all_headers = "*" in allow_headers
+
+        # Headers added to every simple (non-preflight) response
+        self.simple_headers = []
+        if self.allow_all_origins:
+            self.simple_headers.append((b"access-control-allow-origin", b"*"))
+        if allow_credentials:
+            self.simple_headers.append((b"access-control-allow-credentials", b"true"))
+        if expose_headers:
+            self.simple_headers.append(
+                (b"access-control-expose-headers", ", ".join(expose_headers).encode("latin-1"))
+            )
+
+        # Headers added to every successful preflight response
+        self.preflight_headers = []
+        if self.allow_all_origins:
+            self.preflight_headers.append((b"access-control-allow-origin", b"*"))
+        self.preflight_headers.append(
+            (b"access-control-allow-methods", ", ".join(self.allow_methods).encode("latin-1"))
+        )
+        self.preflight_headers.append((b"access-control-max-age", str(max_age).encode("latin-1")))
+        if allow_credentials:
+            self.preflight_headers.append((b"access-control-allow-credentials", b"true"))
+        if not self.allow_all_headers:
+            self.preflight_headers.append(
+                (b"access-control-allow-headers", ", ".join(self.allow_headers).encode("latin-1"))
+            )
+        if not self.allow_all_origins or allow_credentials:
+            # The allowed origin is echoed back, so the answer depends on Origin
+            self.preflight_headers.append((b"vary", b"Origin"))
+
+    async def __call__(self, scope, receive, send) -> None:
+        # Lifespan and websocket scopes are not subject to CORS
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        has_cookie = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+            elif name == b"cookie":
+                has_cookie = True
+
+        # Same-origin requests don't need any CORS headers
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self.preflight_response(origin, request_method, request_headers, send)
+            return
+
+        await self.app(scope, receive, self.wrap_send(send, origin, has_cookie))
+
+    def is_allowed_origin(self, origin: bytes) -> bool:
+        """
+        Checks whether an origin may access the API (a set lookup, no parsing).
+        """
+        return self.allow_all_origins or origin in self.allow_origins
+
+    async def preflight_response(self, origin: bytes, request_method: bytes, request_headers, send) -> None:
+        """
+        Answers an OPTIONS preflight request directly, without calling the app.
+        """
+        headers = list(self.preflight_headers)
+        failures = []
+
+        if self.is_allowed_origin(origin):
+            if not self.allow_all_origins or self.allow_credentials:
+                # Echo the origin back when we can't use the "*" wildcard
+                headers = [h for h in headers if h[0] != b"access-control-allow-origin"]
+                headers.append((b"access-control-allow-origin", origin))
+        else:
+            failures.append("origin")
+
+        if request_method.decode("latin-1") not in self.allow_methods:
+            failures.append("method")
+
+        if self.allow_all_headers and request_headers is not None:
+            headers.append((b"access-control-allow-headers", request_headers))
+        elif request_headers is not None:
+            for header in request_headers.decode("latin-1").lower().split(","):
+                if header.strip() not in self.allow_headers:
+                    failures.append("headers")
+                    break
+
+        if failures:
+            status = 400
+            body = ("Disallowed CORS " + ", ".join(failures)).encode("utf-8")
+        else:
+            status = 200
+            body = b"OK"
+
+        headers.append((b"content-type", b"text/plain; charset=utf-8"))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def wrap_send(self, send, origin: bytes, has_cookie: bool):
+        """
+        Wraps the ASGI send callable so CORS headers are added to the response.
+
+        The origin decision is made once here, so the wrapper itself only
+        appends a precomputed list of headers.
+        """
+        if self.allow_all_origins and not (has_cookie and self.allow_credentials):
+            # Fast path: static "Access-Control-Allow-Origin: *"
+            cors_headers = self.simple_headers
+        elif self.allow_all_origins:
+            # Credentialed requests can't use "*", so echo the origin
+            # (only configured with allow_credentials=True)
+            cors_headers = [h for h in self.simple_headers if h[0] != b"access-control-allow-origin"]
+            cors_headers += [(b"access-control-allow-origin", origin), (b"vary", b"Origin")]
+        elif origin in self.allow_origins:
+            cors_headers = self.simple_headers + [(b"access-control-allow-origin", origin), (b"vary", b"Origin")]
+        else:
+            cors_headers = self.simple_headers
+
+        async def send_with_cors(message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + cors_headers
+            await send(message)
+
+        return send_with_cors
+
+
+class PreflightShortCircuit:
+    """
+    Answers CORS preflight requests before any other middleware runs.
+
+    Only meant for allow-all CORS configurations: every preflight gets the
+    same 204 response, built from a constant header list without looking
+    at the origin or touching routing. The requested headers are echoed
+    back, because "*" doesn't cover Authorization.
+
+    Attributes:
+        app: The wrapped ASGI application
+        allow_methods: HTTP methods advertised to browsers
+        max_age: How long browsers may cache the preflight result (seconds)
+    """
+
+    def __init__(self, app, allow_methods: Sequence[str] = ALL_METHODS, max_age: int = 86400) -> None:
+        if "*" in allow_methods:
+            allow_methods = ALL_METHODS
+
+        self.app = app
+        self.preflight_headers = [
+            (b"access-control-allow-origin", b"*"),
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"content-length", b"0"),
+        ]
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["method"] == "OPTIONS":
+            is_preflight = False
+            request_headers = None
+            for name, value in scope["headers"]:
+                if name == b"access-control-request-method":
+                    is_preflight = True
+                elif name == b"access-control-request-headers":
+                    request_headers = value
+
+            # Plain OPTIONS requests (not a preflight) still go to the app
+            if is_preflight:
+                headers = self.preflight_headers
+                if request_headers is not None:
+                    headers = headers + [(b"access-control-allow-headers", request_headers)]
+                await send({"type": "http.response.start", "status": 204, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        await self.app(scope, receive, send)
+
+
+class UnhandledErrorMiddleware:
+    """
+    Turns unexpected errors into a JSON 500 response.
+
+    Installed inside CORSMiddleware, so the 500 still gets CORS headers and
+    browsers can read it. (Starlette's own handler for plain exceptions runs
+    outside all user middleware.) The traceback is logged once here and the
+    client only sees a generic message.
+
+    Attributes:
+        app: The wrapped ASGI application
+    """
+
+    body = b'{"detail":"Internal server error"}'
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("latin-1")),
+    ]
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking_start(message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracking_start)
+        except Exception:
+            if response_started:
+                # Too late to send a 500 - let the server close the connection
+                raise
+            logger.exception("Unhandled error on %s", scope["path"])
+            await send({"type": "http.response.start", "status": 500, "headers": self.headers})
+            await send({"type": "http.response.body", "body": self.body})
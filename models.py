@@ -8,10 +8,14 @@ FastAPI uses these for:
 - Type checking
 """
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, Field
 from typing import Literal
 
 
+# Simple email shape check: something@domain.tld
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+
 class UserInfo(BaseModel):
     """
     User profile information schema.
@@ -21,8 +25,11 @@ class UserInfo(BaseModel):
         name: User's full name
         stack: Backend technology stack being used
     """
-    email: EmailStr = Field(
+    # Plain pattern check instead of EmailStr (no email-validator needed);
+    # config.validate_settings also warns at startup if USER_EMAIL fails it
+    email: str = Field(
         ...,
+        pattern=EMAIL_PATTERN,
         description="User's email address",
         example="john.doe@example.com"
     )
@@ -8,18 +8,124 @@ separate from the API endpoint definitions.
 import httpx
 from fastapi import HTTPException
 from datetime import datetime, timezone
-from typing import Dict, Any
-import os
+from typing import Dict, Any, Optional
+import asyncio
+import logging
+import time
+
+import orjson
+
+from config import settings
+
+
+logger = logging.getLogger("app")
 
 
 # Configuration constants
 CAT_FACT_API = "https://catfact.ninja/fact"
 REQUEST_TIMEOUT = 5.0  # 5 seconds
+FRESH_TTL = 30.0  # serve cached fact without refreshing (seconds)
+STALE_TTL = 300.0  # serve cached fact while refreshing in background (seconds)
+RETRY_BACKOFF = 10.0  # wait after a failed fetch before calling the API again (seconds)
 
 
-async def fetch_cat_fact() -> str:
+# User information is constant for the lifetime of the process,
+# so it is taken from the settings once at import time
+_USER_INFO: Dict[str, str] = {
+    "email": settings.USER_EMAIL,
+    "name": settings.USER_NAME,
+    "stack": settings.USER_STACK
+}
+
+# Pre-serialized /me response: only the timestamp and fact slots change
+# {"status":"success","user":{...},"timestamp":"<ts>","fact":<fact>}
+_PROFILE_PREFIX = b'{"status":"success","user":' + orjson.dumps(_USER_INFO) + b',"timestamp":"'
+_PROFILE_MID = b'","fact":'
+_PROFILE_SUFFIX = b'}'
+
+
+# Timestamp cache: [millisecond, formatted string] and [second, date/time prefix]
+_ts_cache = [-1, ""]
+_ts_prefix = [-1, ""]
+
+
+# Cat fact cache (stale-while-revalidate)
+_cache: Dict[str, Any] = {"fact": None, "ts": 0.0, "retry_at": 0.0}
+_inflight: Optional[asyncio.Task] = None  # refresh currently running, if any
+
+# Shared HTTP client (connection pool reused across requests)
+_client: Optional[httpx.AsyncClient] = None
+_client_closed = False  # set on shutdown, so no new client is created
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Returns the shared async HTTP client, creating it on first use.
+    
+    Reusing one client keeps connections to the Cat Facts API alive,
+    so requests skip the DNS lookup, TCP connect and TLS handshake.
+    
+    Returns:
+        httpx.AsyncClient: The shared client
+        
+    Raises:
+        RuntimeError: If the client was closed by close_client()
+    """
+    global _client
+    if _client is None:
+        if _client_closed:
+            # Don't open a new client that nobody would close
+            raise RuntimeError("HTTP client is closed")
+        _client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            http2=True
+        )
+    return _client
+
+
+def open_client() -> httpx.AsyncClient:
     """
-    Fetches a random cat fact from the Cat Facts API.
+    Opens the shared HTTP client.
+    
+    Called when the application starts (also after a previous shutdown).
+    
+    Returns:
+        httpx.AsyncClient: The shared client
+    """
+    global _client_closed
+    _client_closed = False
+    return get_client()
+
+
+async def close_client() -> None:
+    """
+    Closes the shared HTTP client and its open connections.
+    
+    Called when the application shuts down. A cat fact refresh still in
+    flight is cancelled first, so it can't outlive the event loop or use
+    the client after it is closed.
+    """
+    global _client, _client_closed, _inflight
+    _client_closed = True
+    
+    if _inflight is not None:
+        task = _inflight
+        _inflight = None
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, HTTPException):
+            pass
+    
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _request_cat_fact() -> str:
+    """
+    Requests a random cat fact from the Cat Facts API.
     
     This function handles all the complexity of:
     - Making an HTTP request
@@ -32,28 +138,21 @@ async def fetch_cat_fact() -> str:
         
     Raises:
         HTTPException: If the API call fails for any reason
-        
-    Example:
-        >>> fact = await fetch_cat_fact()
-        >>> print(fact)
-        "Cats can rotate their ears 180 degrees."
     """
     try:
-        # Create an async HTTP client with timeout
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-            # Make GET request to Cat Facts API
-            response = await client.get(CAT_FACT_API)
-            
-            # Raise exception if status code is 4xx or 5xx
-            response.raise_for_status()
-            
-            # Parse JSON response
-            data = response.json()
-            
-            # Extract fact from response, with fallback
-            fact = data.get("fact", "Cats are amazing creatures!")
-            
-            return fact
+        # Make GET request to Cat Facts API using the shared client
+        response = await get_client().get(CAT_FACT_API)
+        
+        # Raise exception if status code is 4xx or 5xx
+        response.raise_for_status()
+        
+        # Parse JSON response
+        data = response.json()
+        
+        # Extract fact from response, with fallback
+        fact = data.get("fact", "Cats are amazing creatures!")
+        
+        return fact
             
     except httpx.TimeoutException:
         # Handle timeout errors specifically
@@ -76,83 +175,192 @@ async def fetch_cat_fact() -> str:
             detail=f"Failed to connect to Cat Facts API: {str(e)}"
         )
         
-    except Exception as e:
-        # Catch any unexpected errors
+    except Exception:
+        # Catch any unexpected errors (details go to the log, not the client)
+        logger.exception("Unexpected error while fetching cat fact")
         raise HTTPException(
             status_code=500,
-            detail=f"Unexpected error while fetching cat fact: {str(e)}"
+            detail="Unexpected error while fetching cat fact"
         )
 
 
-def get_current_timestamp() -> str:
+async def _refresh_cache() -> str:
     """
-    Gets the current UTC timestamp in ISO 8601 format.
+    Fetches a new cat fact and stores it in the cache.
     
-    ISO 8601 is the international standard for date/time representation.
-    Format: YYYY-MM-DDTHH:MM:SS.mmmmmm+00:00
+    Returns:
+        str: The freshly fetched cat fact
+        
+    On failure the cached fact is left untouched and, if there is one,
+    keeps being served without new fetches for RETRY_BACKOFF seconds.
+    
+    Raises:
+        HTTPException: If the API call fails
+    """
+    try:
+        fact = await _request_cat_fact()
+    except HTTPException:
+        _cache["retry_at"] = time.monotonic() + RETRY_BACKOFF
+        raise
+    _cache["fact"] = fact
+    _cache["ts"] = time.monotonic()
+    _cache["retry_at"] = 0.0
+    return fact
+
+
+def _start_refresh() -> asyncio.Task:
+    """
+    Starts a cache refresh, or returns the one already in flight.
+    
+    Only one request to the Cat Facts API runs at a time (single-flight):
+    every caller that needs a new fact awaits the same task, and shares its
+    result or its error. The task keeps running even if the request that
+    started it is cancelled.
     
     Returns:
-        str: Current UTC timestamp
+        asyncio.Task: The in-flight refresh
+    """
+    global _inflight
+    if _inflight is None:
+        _inflight = asyncio.create_task(_refresh_cache())
+        _inflight.add_done_callback(_refresh_done)
+    return _inflight
+
+
+def _refresh_done(task: asyncio.Task) -> None:
+    """
+    Clears the in-flight refresh once it completes.
+    
+    Background refreshes have nobody awaiting them, so the error is
+    retrieved here to keep asyncio from logging it - the stale fact keeps
+    being served until the Cat Facts API recovers.
+    """
+    global _inflight
+    _inflight = None
+    if not task.cancelled():
+        task.exception()
+
+
+async def warm_fact_cache() -> None:
+    """
+    Pre-loads the cache with a cat fact.
+    
+    Called on startup so the first /me request doesn't wait for the
+    Cat Facts API. Failures are ignored - the next request retries.
+    """
+    try:
+        await _start_refresh()
+    except HTTPException:
+        pass
+
+
+async def fetch_cat_fact() -> str:
+    """
+    Returns a cat fact, using a stale-while-revalidate cache.
+    
+    - Fresh cache (younger than FRESH_TTL): served immediately
+    - Stale cache (younger than STALE_TTL): served immediately and
+      refreshed in the background
+    - Empty or expired cache: fetched inline; concurrent callers await
+      the same in-flight fetch instead of each calling the API
+    
+    If the API fails but an older fact is cached, the old fact is served.
+    After a failed fetch, the API isn't called again for RETRY_BACKOFF
+    seconds while there is an old fact to serve. With an empty cache every
+    request retries (still one call at a time, thanks to single-flight).
+    
+    Returns:
+        str: A random cat fact
+        
+    Raises:
+        HTTPException: If the API call fails and nothing is cached
         
     Example:
-        >>> timestamp = get_current_timestamp()
-        >>> print(timestamp)
-        "2025-10-18T14:30:45.123456+00:00"
+        >>> fact = await fetch_cat_fact()
+        >>> print(fact)
+        "Cats can rotate their ears 180 degrees."
     """
-    return datetime.now(timezone.utc).isoformat()
+    fact = _cache["fact"]
+    now = time.monotonic()
+    age = now - _cache["ts"]
+    
+    if fact and age < FRESH_TTL:
+        return fact
+    
+    if fact and now < _cache["retry_at"]:
+        # The last fetch failed recently - serve the old fact, don't hit the API yet
+        return fact
+    
+    if fact and age < STALE_TTL:
+        # Refresh in the background (joins a refresh already in flight)
+        _start_refresh()
+        return fact
+    
+    try:
+        # shield() so a cancelled request doesn't cancel the shared fetch
+        return await asyncio.shield(_start_refresh())
+    except HTTPException:
+        # Serve the old fact rather than failing the request
+        if _cache["fact"]:
+            return _cache["fact"]
+        raise
 
 
-def get_user_info() -> Dict[str, str]:
+def get_current_timestamp() -> str:
     """
-    Retrieves user information from environment variables.
+    Gets the current UTC timestamp in ISO 8601 format.
+    
+    ISO 8601 is the international standard for date/time representation.
+    Format: YYYY-MM-DDTHH:MM:SS.mmmmmm+00:00
     
-    This function reads user data from environment variables,
-    making it easy to configure without changing code.
+    The timestamp has millisecond precision: requests arriving within the
+    same millisecond share one formatted string, and the date/time prefix
+    is only re-formatted once per second.
     
     Returns:
-        dict: User information (email, name, stack)
+        str: Current UTC timestamp
         
     Example:
-        >>> user = get_user_info()
-        >>> print(user["name"])
-        "John Doe"
+        >>> timestamp = get_current_timestamp()
+        >>> print(timestamp)
+        "2025-10-18T14:30:45.123000+00:00"
     """
-    return {
-        "email": os.getenv("USER_EMAIL", "your.email@example.com"),
-        "name": os.getenv("USER_NAME", "Your Full Name"),
-        "stack": os.getenv("USER_STACK", "Python/FastAPI")
-    }
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms != _ts_cache[0]:
+        seconds, millis = divmod(now_ms, 1000)
+        if seconds != _ts_prefix[0]:
+            _ts_prefix[0] = seconds
+            _ts_prefix[1] = datetime.fromtimestamp(seconds, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _ts_cache[0] = now_ms
+        _ts_cache[1] = f"{_ts_prefix[1]}.{millis:03d}000+00:00"
+    return _ts_cache[1]
 
 
-async def build_profile_response() -> Dict[str, Any]:
+async def build_profile_body() -> bytes:
     """
-    Builds the complete profile response with all required data.
+    Builds the complete profile response as ready-to-send JSON bytes.
     
     This is the main business logic function that:
     1. Fetches a cat fact from external API
     2. Gets current timestamp
-    3. Retrieves user info
-    4. Assembles everything into response format
+    3. Fills both into the pre-serialized response template
+    
+    The constant parts of the JSON (status and user info) are serialized
+    once at import time, so each request only encodes the timestamp and
+    the cat fact.
     
     Returns:
-        dict: Complete profile response data
+        bytes: Complete profile response as JSON
         
     Raises:
         HTTPException: If fetching cat fact fails
     """
-    # Fetch cat fact (this is async, so we await it)
     cat_fact = await fetch_cat_fact()
     
-    # Get current timestamp
-    timestamp = get_current_timestamp()
-    
-    # Get user information
-    user_info = get_user_info()
-    
-    # Build and return response
-    return {
-        "status": "success",
-        "user": user_info,
-        "timestamp": timestamp,
-        "fact": cat_fact
-    }
\ No newline at end of file
+    return b"".join((
+        _PROFILE_PREFIX,
+        get_current_timestamp().encode(),
+        _PROFILE_MID,
+        orjson.dumps(cat_fact),
+        _PROFILE_SUFFIX
+    ))